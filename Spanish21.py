@@ -1,48 +1,133 @@
 import random
 from collections import Counter
-from enum import Enum
 
-class Suit(Enum):
-    HEARTS = '♥'
-    DIAMONDS = '♦'
-    CLUBS = '♣'
-    SPADES = '♠'
+RANKS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', 'J', 'Q', 'K')
+SUIT_CHAR = '♥♦♣♠'  # Indexed by suit id
+ACE = 0
+
+# Cards are small ints: high nibble = suit index, low nibble = rank index
+def make_card(rank, suit):
+    return suit << 4 | rank
+
+CARD_RANK = tuple(card & 0xF for card in range(64))
+CARD_SUIT = tuple(card >> 4 for card in range(64))
+CARD_VALUE = tuple(
+    11 if rank == ACE else 10 if rank >= 9 else rank + 1  # Ace adjusted in hand evaluation
+    for rank in CARD_RANK
+)
+# One Spanish 21 deck (no 10s) in suit-major order
+DECK = tuple(make_card(rank, suit) for suit in range(len(SUIT_CHAR)) for rank in range(len(RANKS)))
+
+# Basic strategy actions
+STAND = 0
+HIT = 1
+SURRENDER = 2
+BUST = 3  # play_hand result only
+
+def _hard_action(player_value, dealer_value):
+    if player_value <= 11:
+        return HIT
+    elif player_value == 12:
+        return STAND if dealer_value in [4, 5, 6] else HIT
+    elif player_value <= 16:
+        return STAND if dealer_value <= 6 else HIT
+    else:  # 17+
+        return STAND
+
+def _soft_action(player_value, dealer_value):
+    if player_value <= 17:
+        return HIT
+    elif player_value == 18:
+        return HIT if dealer_value >= 9 else STAND
+    else:
+        return STAND
+
+# Indexed [player_value][dealer_upcard_value]
+HARD_ACTION = tuple(tuple(_hard_action(p, d) for d in range(12)) for p in range(32))
+SOFT_ACTION = tuple(tuple(_soft_action(p, d) for d in range(12)) for p in range(32))
+# Surrender hard 13-16 vs 7, 8, 9, J, Q, K, A
+SURRENDER_MASK = tuple(tuple(13 <= p <= 16 and d >= 7 for d in range(12)) for p in range(32))
+
+# Match side bets are classified by suited * 3 + nonsuited (index 5 can't occur with 2 cards)
+PAYOUT_TABLE = (0, 3, 6, 12, 15, 0, 24)
+# Match points indexed by player_card ^ dealer_card: same id is suited, same rank nibble is nonsuited
+MATCH_POINTS = tuple(3 if x == 0 else 1 if x & 0xF == 0 else 0 for x in range(64))
+
+# Match result counters, indexed by MATCH_STAT_INDEX[match]
+MATCH_ONE_NONSUITED = 0
+MATCH_TWO_NONSUITED = 1
+MATCH_ONE_SUITED = 2
+MATCH_ONE_SUITED_ONE_NONSUITED = 3
+MATCH_TWO_SUITED = 4
+MATCH_STAT_INDEX = (
+    -1,
+    MATCH_ONE_NONSUITED,
+    MATCH_TWO_NONSUITED,
+    MATCH_ONE_SUITED,
+    MATCH_ONE_SUITED_ONE_NONSUITED,
+    -1,
+    MATCH_TWO_SUITED,
+)
+
+# Simulator stats layout, indexed into Spanish21Simulator.stats
+STAT_HANDS_PLAYED = 0
+STAT_HANDS_WON = 1
+STAT_HANDS_LOST = 2
+STAT_HANDS_PUSHED = 3
+STAT_HANDS_SURRENDERED = 4
+STAT_TOP_BETS_HIT = 5
+STAT_BOTTOM_BETS_HIT = 6
+STAT_TOTAL_TOP_BET_PAYOUT = 7
+STAT_TOTAL_BOTTOM_BET_PAYOUT = 8
+STAT_TOTAL_TOP_BET_WAGERED = 9
+STAT_TOTAL_BOTTOM_BET_WAGERED = 10
+STAT_TOTAL_REGULAR_WAGERED = 11
+STAT_TOTAL_REGULAR_PAYOUT = 12
+STAT_TOP_MATCH_BASE = 13  # 5 match counters, offset by MATCH_*
+STAT_BOTTOM_MATCH_BASE = 18  # 5 match counters, offset by MATCH_*
+STAT_COUNT = 23
+
+def card_repr(card):
+    """Format an int card for display, e.g. 'A♠'"""
+    return f"{RANKS[CARD_RANK[card]]}{SUIT_CHAR[CARD_SUIT[card]]}"
 
 class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    """Display-only wrapper around an int card; the simulator never creates these"""
+    __slots__ = ('card',)
     
-    def value(self):
-        """Return blackjack value of card"""
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 11  # Will be adjusted in hand evaluation
-        else:
-            return int(self.rank)
+    def __init__(self, card):
+        self.card = card
     
-    def __repr__(self):
-        return f"{self.rank}{self.suit.value}"
+    @property
+    def rank(self):
+        return RANKS[CARD_RANK[self.card]]
     
-    def __eq__(self, other):
-        return self.rank == other.rank and self.suit == other.suit
+    @property
+    def suit(self):
+        return CARD_SUIT[self.card]
+    
+    def __repr__(self):
+        return card_repr(self.card)
 
 class Shoe:
-    def __init__(self, num_decks=8):
+    _BASE_DECK = bytes(DECK)  # Canonical single deck, shared by every shoe
+    
+    def __init__(self, num_decks=8, seed=None):
         self.num_decks = num_decks
-        self.cards = []
+        self._rng = random.Random(seed)
+        self._template = self._BASE_DECK * num_decks
+        self.cards = bytearray(len(self._template))
         self.reshuffle()
     
     def reshuffle(self):
-        """Create new shoe with Spanish 21 decks (no 10s)"""
-        self.cards = []
-        ranks = ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'J', 'Q', 'K']
-        for _ in range(self.num_decks):
-            for suit in Suit:
-                for rank in ranks:
-                    self.cards.append(Card(rank, suit))
-        random.shuffle(self.cards)
+        """Refill shoe with Spanish 21 decks (no 10s) and shuffle in place"""
+        cards = self.cards
+        cards[:] = self._template
+        randrange = self._rng.randrange
+        # Fisher-Yates
+        for i in range(len(cards) - 1, 0, -1):
+            j = randrange(i + 1)
+            cards[i], cards[j] = cards[j], cards[i]
     
     def deal(self):
         """Deal one card from shoe"""
@@ -54,44 +139,51 @@ class Shoe:
         return len(self.cards)
 
 class Hand:
+    __slots__ = ('cards', 'bet', 'surrendered', 'is_blackjack', '_sum', '_aces', '_n')
+    
     def __init__(self):
         self.cards = []
         self.bet = 0
         self.surrendered = False
         self.is_blackjack = False
+        self._sum = 0  # Total with every ace counted as 11
+        self._aces = 0
+        self._n = 0  # Number of cards
+    
+    def reset(self):
+        """Clear hand in place for reuse"""
+        self.cards.clear()
+        self.bet = 0
+        self.surrendered = False
+        self.is_blackjack = False
+        self._sum = 0
+        self._aces = 0
+        self._n = 0
     
     def add_card(self, card):
         self.cards.append(card)
+        self._n += 1
+        self._sum += CARD_VALUE[card]
+        if CARD_RANK[card] == ACE:
+            self._aces += 1
+    
+    def _aces_reduced(self):
+        """Number of aces that must count as 1 to avoid busting"""
+        if self._sum <= 21:
+            return 0
+        return min(self._aces, (self._sum - 12) // 10)
     
     def value(self):
         """Calculate hand value, adjusting for aces"""
-        total = sum(card.value() for card in self.cards)
-        aces = sum(1 for card in self.cards if card.rank == 'A')
-        
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
-        
-        return total
+        return self._sum - 10 * self._aces_reduced()
     
     def is_hard(self):
         """Check if hand is hard (no usable ace)"""
-        total = sum(card.value() for card in self.cards)
-        aces = sum(1 for card in self.cards if card.rank == 'A')
-        
-        if aces == 0:
-            return True
-        
-        # Check if using ace as 11 would bust
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
-        
-        return aces == 0
+        return self._aces == self._aces_reduced()
     
     def is_soft(self):
         """Check if hand is soft (has usable ace)"""
-        return not self.is_hard() and 'A' in [card.rank for card in self.cards]
+        return self._aces > self._aces_reduced()
     
     def is_bust(self):
         return self.value() > 21
@@ -100,278 +192,276 @@ class Hand:
         return self.value() == 21
     
     def card_count(self):
-        return len(self.cards)
-
-class MatchResult:
-    def __init__(self):
-        self.one_nonsuited = 0
-        self.two_nonsuited = 0
-        self.one_suited = 0
-        self.one_suited_one_nonsuited = 0
-        self.two_suited = 0
+        return self._n
 
 class Spanish21Simulator:
-    def __init__(self):
+    def __init__(self, max_hands=1):
         self.shoe = Shoe(8)
-        self.stats = {
-            'hands_played': 0,
-            'hands_won': 0,
-            'hands_lost': 0,
-            'hands_pushed': 0,
-            'hands_surrendered': 0,
-            'top_matches': MatchResult(),
-            'bottom_matches': MatchResult(),
-            'top_bets_hit': 0,
-            'bottom_bets_hit': 0,
-            'total_top_bet_payout': 0,
-            'total_bottom_bet_payout': 0,
-            'total_top_bet_wagered': 0,
-            'total_bottom_bet_wagered': 0,
-            'total_regular_wagered': 0,
-            'total_regular_payout': 0,
-        }
-    
-    def evaluate_match(self, player_cards, dealer_card):
-        """Evaluate matching between player cards and dealer card"""
-        matches = {'suited': 0, 'nonsuited': 0}
-        
-        for card in player_cards:
-            if card.rank == dealer_card.rank:
-                if card.suit == dealer_card.suit:
-                    matches['suited'] += 1
-                else:
-                    matches['nonsuited'] += 1
-        
-        return matches
-    
-    def calculate_match_payout(self, matches):
-        """Calculate payout based on matching result"""
-        suited = matches['suited']
-        nonsuited = matches['nonsuited']
-        
-        if suited == 2:
-            return 24  # 2 suited matches
-        elif suited == 1 and nonsuited == 1:
-            return 15  # 1 suited + 1 non-suited
-        elif suited == 1:
-            return 12  # 1 suited match
-        elif nonsuited == 2:
-            return 6   # 2 non-suited matches
-        elif nonsuited == 1:
-            return 3   # 1 non-suited match
+        self._hand_pool = [Hand() for _ in range(max_hands + 1)]  # Dealer + players, reused every round
+        self.stats = [0] * STAT_COUNT
+    
+    def _side_bet_settler(self, top_bet, bottom_bet):
+        """Pick the side bet settlement specialized for which side bets are placed"""
+        if top_bet > 0 and bottom_bet > 0:
+            return self._settle_both_side_bets
+        elif top_bet > 0:
+            return self._settle_top_side_bet
+        elif bottom_bet > 0:
+            return self._settle_bottom_side_bet
         else:
-            return 0   # No match
+            return self._settle_no_side_bets
     
-    def update_match_stats(self, matches, match_result):
-        """Update match statistics"""
-        suited = matches['suited']
-        nonsuited = matches['nonsuited']
-        
-        if suited == 2:
-            match_result.two_suited += 1
-        elif suited == 1 and nonsuited == 1:
-            match_result.one_suited_one_nonsuited += 1
-        elif suited == 1:
-            match_result.one_suited += 1
-        elif nonsuited == 2:
-            match_result.two_nonsuited += 1
-        elif nonsuited == 1:
-            match_result.one_nonsuited += 1
-    
-    def should_hit(self, player_hand, dealer_upcard, auto_surrender, has_top_match):
-        """Spanish 21 basic strategy"""
-        player_value = player_hand.value()
-        dealer_value = dealer_upcard.value()
-        is_soft = player_hand.is_soft()
+    def _settle_no_side_bets(self, player_hands, dealer_upcard, dealer_hole_card, top_bet, bottom_bet):
+        """Return (side bet payout, top match bitmask by hand index) with no side bets placed"""
+        return 0, 0
+    
+    def _settle_top_side_bet(self, player_hands, dealer_upcard, dealer_hole_card, top_bet, bottom_bet):
+        """Return (side bet payout, top match bitmask by hand index) with only the top card bet placed"""
+        stats = self.stats
+        total_payout = 0
+        top_match_bits = 0
+        
+        for i, hand in enumerate(player_hands):
+            card0, card1 = hand.cards
+            top_match = MATCH_POINTS[card0 ^ dealer_upcard] + MATCH_POINTS[card1 ^ dealer_upcard]
+            if top_match:
+                top_payout = top_bet * PAYOUT_TABLE[top_match]
+                stats[STAT_TOP_BETS_HIT] += 1
+                stats[STAT_TOTAL_TOP_BET_PAYOUT] += top_payout
+                stats[STAT_TOP_MATCH_BASE + MATCH_STAT_INDEX[top_match]] += 1
+                total_payout += top_payout
+                top_match_bits |= 1 << i
+        
+        stats[STAT_TOTAL_TOP_BET_WAGERED] += top_bet * len(player_hands)
+        return total_payout, top_match_bits
+    
+    def _settle_bottom_side_bet(self, player_hands, dealer_upcard, dealer_hole_card, top_bet, bottom_bet):
+        """Return (side bet payout, top match bitmask by hand index) with only the bottom card bet placed"""
+        stats = self.stats
+        total_payout = 0
         
-        # Auto surrender logic - only if matched top card
-        if auto_surrender and len(player_hand.cards) == 2 and has_top_match:
-            if player_hand.is_hard() and 13 <= player_value <= 16:
-                if dealer_upcard.rank in ['7', '8', '9', 'J', 'Q', 'K', 'A']:
-                    return 'surrender'
+        for hand in player_hands:
+            card0, card1 = hand.cards
+            bottom_match = MATCH_POINTS[card0 ^ dealer_hole_card] + MATCH_POINTS[card1 ^ dealer_hole_card]
+            if bottom_match:
+                bottom_payout = bottom_bet * PAYOUT_TABLE[bottom_match]
+                stats[STAT_BOTTOM_BETS_HIT] += 1
+                stats[STAT_TOTAL_BOTTOM_BET_PAYOUT] += bottom_payout
+                stats[STAT_BOTTOM_MATCH_BASE + MATCH_STAT_INDEX[bottom_match]] += 1
+                total_payout += bottom_payout
+        
+        stats[STAT_TOTAL_BOTTOM_BET_WAGERED] += bottom_bet * len(player_hands)
+        return total_payout, 0
+    
+    def _settle_both_side_bets(self, player_hands, dealer_upcard, dealer_hole_card, top_bet, bottom_bet):
+        """Return (side bet payout, top match bitmask by hand index) with both side bets placed"""
+        stats = self.stats
+        total_payout = 0
+        top_match_bits = 0
+        
+        for i, hand in enumerate(player_hands):
+            card0, card1 = hand.cards
+            top_match = MATCH_POINTS[card0 ^ dealer_upcard] + MATCH_POINTS[card1 ^ dealer_upcard]
+            bottom_match = MATCH_POINTS[card0 ^ dealer_hole_card] + MATCH_POINTS[card1 ^ dealer_hole_card]
+            if top_match:
+                top_payout = top_bet * PAYOUT_TABLE[top_match]
+                stats[STAT_TOP_BETS_HIT] += 1
+                stats[STAT_TOTAL_TOP_BET_PAYOUT] += top_payout
+                stats[STAT_TOP_MATCH_BASE + MATCH_STAT_INDEX[top_match]] += 1
+                total_payout += top_payout
+                top_match_bits |= 1 << i
+            
+            if bottom_match:
+                bottom_payout = bottom_bet * PAYOUT_TABLE[bottom_match]
+                stats[STAT_BOTTOM_BETS_HIT] += 1
+                stats[STAT_TOTAL_BOTTOM_BET_PAYOUT] += bottom_payout
+                stats[STAT_BOTTOM_MATCH_BASE + MATCH_STAT_INDEX[bottom_match]] += 1
+                total_payout += bottom_payout
+        
+        stats[STAT_TOTAL_TOP_BET_WAGERED] += top_bet * len(player_hands)
+        stats[STAT_TOTAL_BOTTOM_BET_WAGERED] += bottom_bet * len(player_hands)
+        return total_payout, top_match_bits
+    
+    def should_hit(self, player_value, is_soft, dealer_value, can_surrender):
+        """Spanish 21 basic strategy on a precomputed hand state"""
+        # Auto surrender logic - only on the first decision if matched top card
+        if can_surrender and not is_soft and SURRENDER_MASK[player_value][dealer_value]:
+            return SURRENDER
         
-        # Soft hands
         if is_soft:
-            if player_value <= 17:
-                return 'hit'
-            elif player_value == 18:
-                if dealer_value >= 9:
-                    return 'hit'
-                else:
-                    return 'stand'
-            else:
-                return 'stand'
-        
-        # Hard hands
-        if player_value <= 11:
-            return 'hit'
-        elif player_value == 12:
-            if dealer_value in [4, 5, 6]:
-                return 'stand'
-            else:
-                return 'hit'
-        elif 13 <= player_value <= 16:
-            if dealer_value <= 6:
-                return 'stand'
-            else:
-                return 'hit'
-        else:  # 17+
-            return 'stand'
+            return SOFT_ACTION[player_value][dealer_value]
+        return HARD_ACTION[player_value][dealer_value]
     
     def play_hand(self, hand, dealer_upcard, auto_surrender, has_top_match):
-        """Play out a hand using basic strategy"""
+        """Play out a hand using basic strategy, returning STAND, SURRENDER or BUST"""
+        deal = self.shoe.deal
+        should_hit = self.should_hit
+        dealer_value = CARD_VALUE[dealer_upcard]
+        # Track value and soft ace locally instead of re-asking the hand each decision
+        total = hand.value()
+        soft_aces = 1 if hand.is_soft() else 0  # At most one ace can count as 11
+        can_surrender = auto_surrender and has_top_match and hand._n == 2
+        
         while True:
-            action = self.should_hit(hand, dealer_upcard, auto_surrender, has_top_match)
+            action = should_hit(total, soft_aces > 0, dealer_value, can_surrender)
             
-            if action == 'surrender':
+            if action == SURRENDER:
                 hand.surrendered = True
-                return
-            elif action == 'stand':
-                return
-            elif action == 'hit':
-                hand.add_card(self.shoe.deal())
-                if hand.is_bust():
-                    return
+                return SURRENDER
+            elif action == STAND:
+                return STAND
+            elif action == HIT:
+                card = deal()
+                hand.add_card(card)
+                can_surrender = False
+                total += CARD_VALUE[card]
+                if CARD_RANK[card] == ACE:
+                    soft_aces += 1
+                while total > 21 and soft_aces > 0:
+                    total -= 10
+                    soft_aces -= 1
+                if total > 21:
+                    return BUST
     
     def play_dealer_hand(self, dealer_hand):
         """Dealer hits on soft 17"""
-        while dealer_hand.value() < 17 or (dealer_hand.value() == 17 and dealer_hand.is_soft()):
-            dealer_hand.add_card(self.shoe.deal())
+        deal = self.shoe.deal
+        while True:
+            dealer_value = dealer_hand.value()
+            if dealer_value > 17 or (dealer_value == 17 and not dealer_hand.is_soft()):
+                return
+            dealer_hand.add_card(deal())
     
     def determine_winner(self, player_hand, dealer_hand):
         """Determine winner and return payout multiplier"""
         if player_hand.surrendered:
-            self.stats['hands_surrendered'] += 1
+            self.stats[STAT_HANDS_SURRENDERED] += 1
             return 0.5  # Get half bet back
         
-        if player_hand.is_bust():
-            self.stats['hands_lost'] += 1
-            return 0  # Lost
-        
-        player_value = player_hand.value()
-        
-        # Check for player blackjack (natural 21 with 2 cards)
-        if len(player_hand.cards) == 2 and player_value == 21:
-            self.stats['hands_won'] += 1
+        # Natural 21, flagged on the initial deal
+        if player_hand.is_blackjack:
+            self.stats[STAT_HANDS_WON] += 1
             return 2.5  # 3:2 payout
         
-        # Check for 21 with 5 cards
-        if player_value == 21 and len(player_hand.cards) == 5:
-            self.stats['hands_won'] += 1
-            return 2.5  # 3:2 payout
+        player_value = player_hand.value()
         
-        # Check for 21 with 6 cards
-        if player_value == 21 and len(player_hand.cards) == 6:
-            self.stats['hands_won'] += 1
-            return 3  # 2:1 payout
+        if player_value > 21:
+            self.stats[STAT_HANDS_LOST] += 1
+            return 0  # Lost
         
-        # Regular 21 (3+ cards)
         if player_value == 21:
-            self.stats['hands_won'] += 1
-            return 2  # 1:1 payout
+            self.stats[STAT_HANDS_WON] += 1
+            if player_hand._n == 5:
+                return 2.5  # 3:2 payout
+            if player_hand._n == 6:
+                return 3  # 2:1 payout
+            return 2  # 1:1 payout for regular 21 (3+ cards)
         
         # Dealer busts
         if dealer_hand.is_bust():
-            self.stats['hands_won'] += 1
+            self.stats[STAT_HANDS_WON] += 1
             return 2  # 1:1 payout
         
         dealer_value = dealer_hand.value()
         
         # Compare hands
         if player_value > dealer_value:
-            self.stats['hands_won'] += 1
+            self.stats[STAT_HANDS_WON] += 1
             return 2  # 1:1 payout
         elif player_value == dealer_value:
-            self.stats['hands_pushed'] += 1
+            self.stats[STAT_HANDS_PUSHED] += 1
             return 1  # Push
         else:
-            self.stats['hands_lost'] += 1
+            self.stats[STAT_HANDS_LOST] += 1
             return 0  # Lost
     
     def simulate_round(self, num_hands, regular_bet, top_bet, bottom_bet, auto_surrender):
         """Simulate one round with multiple hands"""
-        player_hands = [Hand() for _ in range(num_hands)]
-        dealer_hand = Hand()
+        # Bind hot lookups to locals once per round
+        deal = self.shoe.deal
+        stats = self.stats
+        hand_pool = self._hand_pool
+        if len(hand_pool) <= num_hands:
+            hand_pool.extend(Hand() for _ in range(num_hands + 1 - len(hand_pool)))
+        dealer_hand = hand_pool[0]
+        player_hands = hand_pool[1:num_hands + 1]
+        dealer_hand.reset()
         
         # Initial deal
         for hand in player_hands:
-            hand.add_card(self.shoe.deal())
+            hand.reset()
+            hand.add_card(deal())
             hand.bet = regular_bet
-        dealer_hand.add_card(self.shoe.deal())  # Dealer upcard
+        dealer_hand.add_card(deal())  # Dealer upcard
         
         for hand in player_hands:
-            hand.add_card(self.shoe.deal())
-        dealer_hand.add_card(self.shoe.deal())  # Dealer hole card
+            hand.add_card(deal())
+        dealer_hand.add_card(deal())  # Dealer hole card
         
-        # Check for dealer blackjack
-        dealer_has_blackjack = (len(dealer_hand.cards) == 2 and dealer_hand.value() == 21)
+        # Flag naturals once, including against a dealer blackjack
+        for hand in player_hands:
+            hand.is_blackjack = hand.value() == 21
+        dealer_has_blackjack = dealer_hand.value() == 21
         
-        total_payout = 0
+        dealer_upcard, dealer_hole_card = dealer_hand.cards
+        settle_side_bets = self._side_bet_settler(top_bet, bottom_bet)
         
         # Evaluate side bets and store match info for each hand
-        hand_has_top_match = []
-        for hand in player_hands:
-            # Top card match
-            has_match = False
-            if top_bet > 0:
-                top_matches = self.evaluate_match(hand.cards, dealer_hand.cards[0])
-                top_payout = self.calculate_match_payout(top_matches)
-                if top_payout > 0:
-                    has_match = True
-                    self.stats['top_bets_hit'] += 1
-                    total_payout += top_bet * top_payout
-                    self.stats['total_top_bet_payout'] += top_bet * top_payout
-                    self.update_match_stats(top_matches, self.stats['top_matches'])
-                self.stats['total_top_bet_wagered'] += top_bet
-            hand_has_top_match.append(has_match)
-            
-            # Bottom card match
-            if bottom_bet > 0:
-                bottom_matches = self.evaluate_match(hand.cards, dealer_hand.cards[1])
-                bottom_payout = self.calculate_match_payout(bottom_matches)
-                if bottom_payout > 0:
-                    self.stats['bottom_bets_hit'] += 1
-                    total_payout += bottom_bet * bottom_payout
-                    self.stats['total_bottom_bet_payout'] += bottom_bet * bottom_payout
-                    self.update_match_stats(bottom_matches, self.stats['bottom_matches'])
-                self.stats['total_bottom_bet_wagered'] += bottom_bet
+        total_payout, top_match_bits = settle_side_bets(
+            player_hands, dealer_upcard, dealer_hole_card, top_bet, bottom_bet
+        )
         
         # Play regular hands if dealer doesn't have blackjack
         if not dealer_has_blackjack:
+            live_hands = 0
             for i, hand in enumerate(player_hands):
-                # Check for player blackjack
-                if len(hand.cards) == 2 and hand.value() == 21:
-                    hand.is_blackjack = True
-                else:
-                    self.play_hand(hand, dealer_hand.cards[0], auto_surrender, hand_has_top_match[i])
+                if not hand.is_blackjack:
+                    if self.play_hand(hand, dealer_upcard, auto_surrender, top_match_bits >> i & 1) == STAND:
+                        live_hands += 1
             
-            # Dealer plays if at least one player didn't bust/surrender
-            if any(not hand.is_bust() and not hand.surrendered for hand in player_hands):
+            # Dealer plays only if a hand still stands against it (not a natural, bust or surrender)
+            if live_hands:
                 self.play_dealer_hand(dealer_hand)
         
         # Determine winners and payouts
         for hand in player_hands:
-            self.stats['total_regular_wagered'] += regular_bet
+            stats[STAT_TOTAL_REGULAR_WAGERED] += regular_bet
             
             if dealer_has_blackjack:
                 if hand.is_blackjack:
                     # Push on blackjack vs blackjack
-                    self.stats['hands_pushed'] += 1
+                    stats[STAT_HANDS_PUSHED] += 1
                     total_payout += regular_bet
-                    self.stats['total_regular_payout'] += regular_bet
+                    stats[STAT_TOTAL_REGULAR_PAYOUT] += regular_bet
                 else:
                     # Player loses to dealer blackjack
-                    self.stats['hands_lost'] += 1
+                    stats[STAT_HANDS_LOST] += 1
                     # No payout (already accounted for by not adding anything)
             else:
                 multiplier = self.determine_winner(hand, dealer_hand)
                 payout = regular_bet * multiplier
                 total_payout += payout
-                self.stats['total_regular_payout'] += payout
+                stats[STAT_TOTAL_REGULAR_PAYOUT] += payout
         
-        self.stats['hands_played'] += num_hands
+        stats[STAT_HANDS_PLAYED] += num_hands
         return total_payout
 
+    def simulate_rounds(self, num_rounds, num_hands, regular_bet, top_bet, bottom_bet, auto_surrender, bankroll):
+        """Simulate up to num_rounds rounds, stopping when bankroll can't cover the bets.
+        
+        Returns (final bankroll, rounds played).
+        """
+        simulate_round = self.simulate_round
+        bet_per_round = (regular_bet + top_bet + bottom_bet) * num_hands
+        
+        for rounds_played in range(num_rounds):
+            if bankroll < bet_per_round:
+                return bankroll, rounds_played
+            bankroll -= bet_per_round
+            bankroll += simulate_round(num_hands, regular_bet, top_bet, bottom_bet, auto_surrender)
+        
+        return bankroll, num_rounds
+
 def main():
     print("=" * 60)
     print("SPANISH 21 PROBABILITY CALCULATOR")
@@ -411,27 +501,18 @@ def main():
     print("SIMULATION STARTING...")
     print("=" * 60)
     
-    simulator = Spanish21Simulator()
+    simulator = Spanish21Simulator(hands_per_round)
     current_bankroll = bankroll
-    rounds_played = 0
     total_rounds = total_hands // hands_per_round
     
     bet_per_round = (regular_bet + top_bet + bottom_bet) * hands_per_round
     
-    for round_num in range(total_rounds):
-        # Check if we have enough bankroll
-        if current_bankroll < bet_per_round:
-            print(f"\nInsufficient funds after {simulator.stats['hands_played']} hands!")
-            print(f"Needed: ${bet_per_round:.2f}, Available: ${current_bankroll:.2f}")
-            break
-        
-        # Deduct bets
-        current_bankroll -= bet_per_round
-        
-        # Play round
-        payout = simulator.simulate_round(hands_per_round, regular_bet, top_bet, bottom_bet, auto_surrender)
-        current_bankroll += payout
-        rounds_played += 1
+    current_bankroll, rounds_played = simulator.simulate_rounds(
+        total_rounds, hands_per_round, regular_bet, top_bet, bottom_bet, auto_surrender, current_bankroll
+    )
+    if rounds_played < total_rounds:
+        print(f"\nInsufficient funds after {simulator.stats[STAT_HANDS_PLAYED]} hands!")
+        print(f"Needed: ${bet_per_round:.2f}, Available: ${current_bankroll:.2f}")
     
     # Print results
     print("\n" + "=" * 60)
@@ -440,67 +521,67 @@ def main():
     print(f"\nStarting Bankroll: ${bankroll:.2f}")
     print(f"Final Bankroll: ${current_bankroll:.2f}")
     print(f"Net Profit/Loss: ${current_bankroll - bankroll:.2f}")
-    print(f"\nHands Played: {simulator.stats['hands_played']}")
+    print(f"\nHands Played: {simulator.stats[STAT_HANDS_PLAYED]}")
     print(f"Rounds Played: {rounds_played} / {total_rounds}")
     
     print("\n" + "-" * 60)
     print("HAND RESULTS")
     print("-" * 60)
-    print(f"Hands Won: {simulator.stats['hands_won']}")
-    print(f"Hands Lost: {simulator.stats['hands_lost']}")
-    print(f"Hands Pushed: {simulator.stats['hands_pushed']}")
-    print(f"Hands Surrendered: {simulator.stats['hands_surrendered']}")
-    if simulator.stats['hands_played'] > 0:
-        win_rate = (simulator.stats['hands_won'] / simulator.stats['hands_played']) * 100
+    print(f"Hands Won: {simulator.stats[STAT_HANDS_WON]}")
+    print(f"Hands Lost: {simulator.stats[STAT_HANDS_LOST]}")
+    print(f"Hands Pushed: {simulator.stats[STAT_HANDS_PUSHED]}")
+    print(f"Hands Surrendered: {simulator.stats[STAT_HANDS_SURRENDERED]}")
+    if simulator.stats[STAT_HANDS_PLAYED] > 0:
+        win_rate = (simulator.stats[STAT_HANDS_WON] / simulator.stats[STAT_HANDS_PLAYED]) * 100
         print(f"Win Rate: {win_rate:.2f}%")
     
     print("\n" + "-" * 60)
     print("REGULAR BET STATISTICS")
     print("-" * 60)
-    print(f"Total Wagered: ${simulator.stats['total_regular_wagered']:.2f}")
-    print(f"Total Returned: ${simulator.stats['total_regular_payout']:.2f}")
-    regular_ev = simulator.stats['total_regular_payout'] - simulator.stats['total_regular_wagered']
+    print(f"Total Wagered: ${simulator.stats[STAT_TOTAL_REGULAR_WAGERED]:.2f}")
+    print(f"Total Returned: ${simulator.stats[STAT_TOTAL_REGULAR_PAYOUT]:.2f}")
+    regular_ev = simulator.stats[STAT_TOTAL_REGULAR_PAYOUT] - simulator.stats[STAT_TOTAL_REGULAR_WAGERED]
     print(f"Net EV: ${regular_ev:.2f}")
-    if simulator.stats['total_regular_wagered'] > 0:
-        regular_roi = (regular_ev / simulator.stats['total_regular_wagered']) * 100
+    if simulator.stats[STAT_TOTAL_REGULAR_WAGERED] > 0:
+        regular_roi = (regular_ev / simulator.stats[STAT_TOTAL_REGULAR_WAGERED]) * 100
         print(f"ROI: {regular_roi:.2f}%")
     
     # Top card match statistics
-    if simulator.stats['total_top_bet_wagered'] > 0:
+    if simulator.stats[STAT_TOTAL_TOP_BET_WAGERED] > 0:
         print("\n" + "-" * 60)
         print("MATCH DEALER TOP CARD STATISTICS")
         print("-" * 60)
-        print(f"Total Side Bets Hit: {simulator.stats['top_bets_hit']}")
-        top_stats = simulator.stats['top_matches']
-        print(f"1 Non-suited Match: {top_stats.one_nonsuited}")
-        print(f"2 Non-suited Matches: {top_stats.two_nonsuited}")
-        print(f"1 Suited Match: {top_stats.one_suited}")
-        print(f"1 Suited + 1 Non-suited: {top_stats.one_suited_one_nonsuited}")
-        print(f"2 Suited Matches: {top_stats.two_suited}")
-        print(f"\nTotal Wagered: ${simulator.stats['total_top_bet_wagered']:.2f}")
-        print(f"Total Returned: ${simulator.stats['total_top_bet_payout']:.2f}")
-        top_ev = simulator.stats['total_top_bet_payout'] - simulator.stats['total_top_bet_wagered']
+        print(f"Total Side Bets Hit: {simulator.stats[STAT_TOP_BETS_HIT]}")
+        top_stats = simulator.stats[STAT_TOP_MATCH_BASE:STAT_TOP_MATCH_BASE + 5]
+        print(f"1 Non-suited Match: {top_stats[MATCH_ONE_NONSUITED]}")
+        print(f"2 Non-suited Matches: {top_stats[MATCH_TWO_NONSUITED]}")
+        print(f"1 Suited Match: {top_stats[MATCH_ONE_SUITED]}")
+        print(f"1 Suited + 1 Non-suited: {top_stats[MATCH_ONE_SUITED_ONE_NONSUITED]}")
+        print(f"2 Suited Matches: {top_stats[MATCH_TWO_SUITED]}")
+        print(f"\nTotal Wagered: ${simulator.stats[STAT_TOTAL_TOP_BET_WAGERED]:.2f}")
+        print(f"Total Returned: ${simulator.stats[STAT_TOTAL_TOP_BET_PAYOUT]:.2f}")
+        top_ev = simulator.stats[STAT_TOTAL_TOP_BET_PAYOUT] - simulator.stats[STAT_TOTAL_TOP_BET_WAGERED]
         print(f"Net EV: ${top_ev:.2f}")
-        top_roi = (top_ev / simulator.stats['total_top_bet_wagered']) * 100
+        top_roi = (top_ev / simulator.stats[STAT_TOTAL_TOP_BET_WAGERED]) * 100
         print(f"ROI: {top_roi:.2f}%")
     
     # Bottom card match statistics
-    if simulator.stats['total_bottom_bet_wagered'] > 0:
+    if simulator.stats[STAT_TOTAL_BOTTOM_BET_WAGERED] > 0:
         print("\n" + "-" * 60)
         print("MATCH DEALER BOTTOM CARD STATISTICS")
         print("-" * 60)
-        print(f"Total Side Bets Hit: {simulator.stats['bottom_bets_hit']}")
-        bottom_stats = simulator.stats['bottom_matches']
-        print(f"1 Non-suited Match: {bottom_stats.one_nonsuited}")
-        print(f"2 Non-suited Matches: {bottom_stats.two_nonsuited}")
-        print(f"1 Suited Match: {bottom_stats.one_suited}")
-        print(f"1 Suited + 1 Non-suited: {bottom_stats.one_suited_one_nonsuited}")
-        print(f"2 Suited Matches: {bottom_stats.two_suited}")
-        print(f"\nTotal Wagered: ${simulator.stats['total_bottom_bet_wagered']:.2f}")
-        print(f"Total Returned: ${simulator.stats['total_bottom_bet_payout']:.2f}")
-        bottom_ev = simulator.stats['total_bottom_bet_payout'] - simulator.stats['total_bottom_bet_wagered']
+        print(f"Total Side Bets Hit: {simulator.stats[STAT_BOTTOM_BETS_HIT]}")
+        bottom_stats = simulator.stats[STAT_BOTTOM_MATCH_BASE:STAT_BOTTOM_MATCH_BASE + 5]
+        print(f"1 Non-suited Match: {bottom_stats[MATCH_ONE_NONSUITED]}")
+        print(f"2 Non-suited Matches: {bottom_stats[MATCH_TWO_NONSUITED]}")
+        print(f"1 Suited Match: {bottom_stats[MATCH_ONE_SUITED]}")
+        print(f"1 Suited + 1 Non-suited: {bottom_stats[MATCH_ONE_SUITED_ONE_NONSUITED]}")
+        print(f"2 Suited Matches: {bottom_stats[MATCH_TWO_SUITED]}")
+        print(f"\nTotal Wagered: ${simulator.stats[STAT_TOTAL_BOTTOM_BET_WAGERED]:.2f}")
+        print(f"Total Returned: ${simulator.stats[STAT_TOTAL_BOTTOM_BET_PAYOUT]:.2f}")
+        bottom_ev = simulator.stats[STAT_TOTAL_BOTTOM_BET_PAYOUT] - simulator.stats[STAT_TOTAL_BOTTOM_BET_WAGERED]
         print(f"Net EV: ${bottom_ev:.2f}")
-        bottom_roi = (bottom_ev / simulator.stats['total_bottom_bet_wagered']) * 100
+        bottom_roi = (bottom_ev / simulator.stats[STAT_TOTAL_BOTTOM_BET_WAGERED]) * 100
         print(f"ROI: {bottom_roi:.2f}%")
     
     print("\n" + "=" * 60)